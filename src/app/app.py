@@ -1,13 +1,18 @@
 from __future__ import annotations
 import os
 import json
-import re
-import requests
 import markdown
-from datetime import date, timedelta, datetime
+try:
+    import cmarkgfm  # C-backed GitHub-flavored markdown renderer
+except ImportError:  # fall back to the pure-Python renderer
+    cmarkgfm = None
+from functools import lru_cache
+from datetime import date, time, timedelta, datetime
 from typing import List, Dict, Any
 from dateutil import parser as dateparser
+from cachelib import FileSystemCache
 from flask import Flask, render_template, request, redirect, url_for, flash, session
+from flask_session import Session
 
 import data_access_layer.data_store as db
 from data_object_model.application_state import Schedule, Entry, DateRange
@@ -18,17 +23,32 @@ from model_access_layer.agent import handle_user_prompt
 app = Flask(__name__)
 app.secret_key = os.environ.get("SECRET_KEY", "dev-secret")
 
+# Server-side sessions: the daterange and conversation (incl. rendered HTML) stay on disk,
+# the browser only carries the session id cookie.
+app.config["SESSION_TYPE"] = "cachelib"
+app.config["SESSION_PERMANENT"] = False  # session cookie expires when the browser closes
+app.config["SESSION_CACHELIB"] = FileSystemCache(cache_dir=os.path.join("db", "sessions"), threshold=500)
+Session(app)
+
 # In-memory storage for the POC (resets on restart)
 SCHEDULE: List[Dict[str, Any]] = []
 
 # Helper: normalize and validate a schedule item
 # Schema: {day: "Mon".."Sun", start: "09:00", end: "10:30", title: str, note?: str, provider?: str}
 DAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+_DAY_INDEX = {d: i for i, d in enumerate(DAYS)}
 
 # Default configuration parameters (future update should centralize these)
 DEFAULT_DATE_RANGE_DAYS = 7
 
 
+def _render_markdown(text: str) -> str:
+    """Render LLM markdown output to HTML, preferring the C-backed renderer when installed."""
+    if cmarkgfm is not None:
+        return cmarkgfm.github_flavored_markdown_to_html(text)
+    return markdown.markdown(text)
+
+
 def current_week_start(today: date | None = None) -> date:
     base = today or date.today()
     return base - timedelta(days=base.weekday())
@@ -39,15 +59,51 @@ def week_bounds() -> tuple[date, date]:
     return start, start + timedelta(days=6)
 
 
-def _to_hhmm(s: str) -> str:
-    """Parse various time inputs to 'HH:MM' (24h)."""
+def _parse_simple_time(s: str) -> tuple[int, int] | None:
+    """
+    Hand parser for the common typed forms 'H:MM', 'HH.MM' and 'H[:MM] am/pm'.
+    Returns (hour, minute), or None when the input should go to dateutil instead.
+    """
+    text = s.lower()
+    meridiem = None
+    if text.endswith(("am", "pm")):
+        meridiem = text[-2:]
+        text = text[:-2].rstrip()
+    hh, sep, mm = text.replace(".", ":").partition(":")
+    if not hh.isdecimal() or len(hh) > 2 or (sep and (len(mm) != 2 or not mm.isdecimal())):
+        return None
+    hour = int(hh)
+    minute = int(mm) if sep else 0
+    if meridiem:
+        if not 1 <= hour <= 12:
+            return None
+        hour = hour % 12 + (12 if meridiem == "pm" else 0)
+    elif not sep:
+        # A bare number ('9', '930') is ambiguous; leave it to dateutil
+        return None
+    if hour > 23 or minute > 59:
+        return None
+    return hour, minute
+
+
+@lru_cache(maxsize=512)
+def _parse_hhmm(s: str) -> time:
+    """Parse various time inputs to a minute-resolution time (24h)."""
+    s = s.strip()
+    # Fast path: form inputs are almost always already ISO 'HH:MM' or 'HH:MM:SS'
+    # (the shape check keeps inputs like '10.30' away from fromisoformat's fractional hours)
+    if len(s) >= 5 and s[2] == ":":
+        try:
+            return time.fromisoformat(s).replace(second=0, microsecond=0, tzinfo=None)
+        except ValueError:
+            pass
+    hour_minute = _parse_simple_time(s)
+    if hour_minute is not None:
+        return time(*hour_minute)
     try:
         t = dateparser.parse(s).time()
-        return f"{t.hour:02d}:{t.minute:02d}"
+        return time(t.hour, t.minute)
     except Exception:
-        # fallback: accept already-well-formed HH:MM
-        if re.match(r"^\d{2}:\d{2}$", s):
-            return s
         raise ValueError(f"Invalid time: {s}")
 
 
@@ -66,24 +122,19 @@ def add_item(
     but now creates an Entry object and stores it in the DB.
     """
     # Normalise day ("Mon".."Sun")
-    day_norm = day.strip().title()[:3]
-    if day_norm not in DAYS:
+    day_offset = _DAY_INDEX.get(day.strip().title()[:3])
+    if day_offset is None:
         raise ValueError("Day must be one of Mon..Sun")
 
     # Normalise and validate times using the existing helper
-    start_hhmm = _to_hhmm(start)
-    end_hhmm = _to_hhmm(end)
-    if end_hhmm <= start_hhmm:
+    start_time = _parse_hhmm(start)
+    end_time = _parse_hhmm(end)
+    if end_time <= start_time:
         raise ValueError("End must be after start")
 
-    # Convert HH:MM strings to time objects for Entry
-    start_time = datetime.strptime(start_hhmm, "%H:%M").time()
-    end_time = datetime.strptime(end_hhmm, "%H:%M").time()
-
     # Map day-of-week to a concrete date in the current week
     week_start = current_week_start()
-    day_index = {d: i for i, d in enumerate(DAYS)}
-    entry_date = week_start + timedelta(days=day_index[day_norm])
+    entry_date = week_start + timedelta(days=day_offset)
 
     # Build Entry object
     entry = Entry(
@@ -104,19 +155,6 @@ def clear_schedule() -> None:
     SCHEDULE.clear()
 
 
-def sorted_schedule() -> List[Dict[str, Any]]:
-    day_index = {d: i for i, d in enumerate(DAYS)}
-    normalised_items: List[Dict[str, Any]] = []
-    for item in SCHEDULE:
-        normalised_items.append(
-            {
-                **item,
-                "provider": item.get("provider", "Unassigned") or "Unassigned",
-            }
-        )
-    return sorted(normalised_items, key=lambda x: (day_index[x["day"]], x["start"]))
-
-
 # ----------------------------
 # Jinja context helpers
 # ----------------------------
@@ -148,12 +186,6 @@ def index():
     schedule = db.get_schedule(1, daterange)
     session["daterange"] = daterange.to_primitive()
 
-    # Convert LLM response markdown → HTML if present
-    conversation = session.get("conversation")
-    if conversation and conversation.get("response"):
-        html = markdown.markdown(conversation["response"])
-        session["conversation"]["html_response"] = html
-
     return render_template("index.html", schedule=schedule)
 
 
@@ -202,7 +234,11 @@ def generate():
     agent_query = AgentQuery(user_prompt=user_prompt)
     daterange = DateRange.from_primitive(session.get("daterange"))
     schedule = db.get_schedule(1, daterange)
-    session["conversation"] = handle_user_prompt(agent_query, schedule)
+    agent_response = handle_user_prompt(agent_query, schedule)
+    # html_response is rendered once per conversation and read by index.html
+    conversation = agent_response.to_dict()
+    conversation["html_response"] = _render_markdown(agent_response.response or "")
+    session["conversation"] = conversation
     # Update the session DateRange in case a tool made an update.
     session["daterange"] = schedule.daterange.to_primitive()
     return redirect(url_for("index"))
@@ -231,10 +267,8 @@ def remove():
         flash("No matching schedule items found.", "warning")
         return redirect(url_for("index"))
 
-    # Remove each entry; using user_id=1 to match get_schedule()
-    deleted_count = 0
-    for entry in entries:
-        deleted_count += db.remove_entry(entry, user_id=1)
+    # Remove them in one statement; using user_id=1 to match get_schedule()
+    deleted_count = len(db.remove_entries(entries, user_id=1))
 
     if deleted_count == 0:
         flash("No schedule items were removed.", "warning")
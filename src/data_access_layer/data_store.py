@@ -2,7 +2,10 @@
 """All data persistence goes through this interface. This implementation uses a local SQL DB."""
 from __future__ import annotations
 
+import json
+import logging
 import sqlite3
+import threading
 from pathlib import Path
 from contextlib import contextmanager
 from typing import List, Optional, Iterable
@@ -10,6 +13,8 @@ from datetime import datetime, date, time
 
 from data_object_model.application_state import Schedule, Entry, DateRange
 
+logger = logging.getLogger(__name__)
+
 # --- DB bootstrap ----------------------------------------------------------------
 
 _DB_DIR = Path("db")
@@ -31,29 +36,51 @@ CREATE TABLE IF NOT EXISTS entries (
 CREATE INDEX IF NOT EXISTS idx_entries_user_date
     ON entries(user_id, entry_date);
 
-CREATE INDEX IF NOT EXISTS idx_entries_date
-    ON entries(entry_date);
+-- Covers get_schedule entirely: date range scan, ORDER BY and projection from the index alone.
+-- Its entry_date prefix serves every lookup idx_entries_date did, so that index is dropped.
+DROP INDEX IF EXISTS idx_entries_date;
+CREATE INDEX IF NOT EXISTS idx_entries_covering
+    ON entries(entry_date, start_time, id, user_id, end_time, title, provider, note);
+"""
+
+
+# Read-side defaults for provider/note, shared by every SELECT that builds Entry objects so
+# get_schedule, get_entries and get_entries_by_ids all hand out the same values.
+_PROVIDER_COL = "COALESCE(NULLIF(provider, ''), 'Unassigned') AS provider"
+_NOTE_COL = "COALESCE(note, '') AS note"
+
+
+_PRAGMAS_SQL = """
+PRAGMA journal_mode = WAL;
+PRAGMA synchronous = NORMAL;
+PRAGMA temp_store = MEMORY;
 """
 
 
-def _ensure_db() -> None:
+def _ensure_db() -> sqlite3.Connection:
     _DB_DIR.mkdir(parents=True, exist_ok=True)
-    with sqlite3.connect(_DB_PATH) as con:
-        con.executescript(_SCHEMA_SQL)
-        con.commit()
+    # One connection for the process lifetime, shared across Flask worker threads.
+    # Access is serialized by _CON_LOCK, so check_same_thread can be disabled.
+    con = sqlite3.connect(_DB_PATH, check_same_thread=False)
+    con.executescript(_PRAGMAS_SQL)
+    con.executescript(_SCHEMA_SQL)
+    con.commit()
+    return con
 
 
-_ensure_db()
+_CON = _ensure_db()
+_CON_LOCK = threading.Lock()
 
 
 @contextmanager
 def _conn():
-    con = sqlite3.connect(_DB_PATH)
-    try:
-        yield con
-        con.commit()
-    finally:
-        con.close()
+    with _CON_LOCK:
+        try:
+            yield _CON
+            _CON.commit()
+        except BaseException:
+            _CON.rollback()
+            raise
 
 
 # --- Helpers ---------------------------------------------------------------------
@@ -101,48 +128,36 @@ def _entry_from_row(row: tuple) -> Entry:
 
 
 def get_schedule(user_id: int, daterange: DateRange) -> Schedule:
-    start_d = daterange.date_from.date()
-    end_d = daterange.date_to.date()
+    start_d = daterange.date_from_d
+    end_d = daterange.date_to_d
 
     with _conn() as con:
         cur = con.cursor()
         cur.execute(
-            """
+            f"""
             SELECT id,
                    entry_date,
                    start_time,
                    end_time,
                    title,
-                   provider,
-                   note
+                   {_PROVIDER_COL},
+                   {_NOTE_COL}
             FROM entries
-            WHERE (user_id = ? OR user_id IS NULL)
-              AND entry_date BETWEEN ? AND ?
+            WHERE entry_date BETWEEN ? AND ?
+              AND IFNULL(user_id, ?) IS ?  -- same as (user_id = ? OR user_id IS NULL), NULL user_id included
             ORDER BY entry_date, start_time, id
             """,
-            (user_id, _to_iso_date(start_d), _to_iso_date(end_d)),
+            (_to_iso_date(start_d), _to_iso_date(end_d), user_id, user_id),
         )
         rows = cur.fetchall()
 
-        entries: List[Entry] = []
-
-        for row in rows:
-            entry_id, entry_date, start_time, end_time, title, provider, note = row
-            entries.append(
-                Entry(
-                    entry_id=entry_id,
-                    entry_date=entry_date,
-                    start_time=start_time,
-                    end_time=end_time,
-                    title=title,
-                    provider=provider,
-                    note=note,
-                )
-            )
+    # The SELECT column order matches Entry's positional parameters; build entries
+    # after releasing the connection lock.
+    entries: List[Entry] = [Entry(*row) for row in rows]
 
-    print(
-        f"Entries queried for user_id {user_id}, "
-        f"from/to dates {_to_iso_date(start_d), _to_iso_date(end_d)}: {entries}"
+    logger.debug(
+        "Entries queried for user_id %s, from/to dates %s/%s: %s",
+        user_id, start_d, end_d, entries,
     )
     return Schedule(daterange, entries=entries)
 
@@ -152,17 +167,18 @@ def get_entries_by_ids(entry_ids: Iterable[int]) -> List[Entry]:
     if not ids:
         return []
 
-    placeholders = ",".join("?" for _ in ids)
+    # A single JSON array parameter keeps the statement text constant for any number of ids
+    # (one cached prepared statement) and sidesteps SQLite's bound-variable limit.
     with _conn() as con:
         cur = con.cursor()
         cur.execute(
             f"""
-            SELECT id, user_id, entry_date, start_time, end_time, title, provider, note, created_at
+            SELECT id, user_id, entry_date, start_time, end_time, title, {_PROVIDER_COL}, {_NOTE_COL}, created_at
             FROM entries
-            WHERE id IN ({placeholders})
+            WHERE id IN (SELECT value FROM json_each(?))
             ORDER BY entry_date, start_time, id
             """,
-            tuple(ids),
+            (json.dumps(ids),),
         )
         rows = cur.fetchall()
 
@@ -179,8 +195,8 @@ def get_entries(
         cur = con.cursor()
         if user_id is None:
             cur.execute(
-                """
-                SELECT id, user_id, entry_date, start_time, end_time, title, provider, note, created_at
+                f"""
+                SELECT id, user_id, entry_date, start_time, end_time, title, {_PROVIDER_COL}, {_NOTE_COL}, created_at
                 FROM entries
                 WHERE entry_date BETWEEN ? AND ?
                 ORDER BY entry_date, start_time, id
@@ -189,8 +205,8 @@ def get_entries(
             )
         else:
             cur.execute(
-                """
-                SELECT id, user_id, entry_date, start_time, end_time, title, provider, note, created_at
+                f"""
+                SELECT id, user_id, entry_date, start_time, end_time, title, {_PROVIDER_COL}, {_NOTE_COL}, created_at
                 FROM entries
                 WHERE (user_id = ? OR user_id IS NULL)
                   AND entry_date BETWEEN ? AND ?
@@ -204,26 +220,33 @@ def get_entries(
 
 
 def add_entry(entry: Entry, user_id: Optional[int] = None) -> int:
+    return add_entries([entry], user_id=user_id)[0]
+
+
+def add_entries(entries: Iterable[Entry], user_id: Optional[int] = None) -> List[int]:
+    """Insert several entries in a single transaction; sets and returns each new entry_id."""
+    entry_ids: List[int] = []
     with _conn() as con:
         cur = con.cursor()
-        cur.execute(
-            """
-            INSERT INTO entries (user_id, entry_date, start_time, end_time, title, provider, note, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                user_id,
-                _to_iso_date(entry.entry_date),
-                _to_iso_time(entry.start_time),
-                _to_iso_time(entry.end_time),
-                entry.title,
-                entry.provider,
-                entry.note or "",
-                datetime.utcnow().isoformat(timespec="seconds"),
-            ),
-        )
-        entry.entry_id = cur.lastrowid
-        return entry.entry_id
+        for entry in entries:
+            cur.execute(
+                """
+                INSERT INTO entries (user_id, entry_date, start_time, end_time, title, provider, note, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, strftime('%Y-%m-%dT%H:%M:%S', 'now'))
+                """,
+                (
+                    user_id,
+                    _to_iso_date(entry.entry_date),
+                    _to_iso_time(entry.start_time),
+                    _to_iso_time(entry.end_time),
+                    entry.title,
+                    entry.provider,
+                    entry.note or "",
+                ),
+            )
+            entry.entry_id = cur.lastrowid
+            entry_ids.append(entry.entry_id)
+    return entry_ids
 
 
 def update_entry(entry: Entry, user_id: Optional[int] = None) -> int:
@@ -278,3 +301,32 @@ def remove_entry(entry: Entry, user_id: Optional[int] = None) -> int:
                 (entry.entry_id, user_id),
             )
         return cur.rowcount
+
+
+def remove_entries(entries: Iterable[Entry], user_id: Optional[int] = None) -> List[int]:
+    """
+    Delete several entries with a single statement and transaction.
+    Returns the ids that were actually deleted (in no particular order).
+    """
+    ids = [e.entry_id for e in entries]
+    if not ids:
+        return []
+
+    # Same json_each binding as get_entries_by_ids: constant statement text, no bound-variable limit
+    with _conn() as con:
+        cur = con.cursor()
+        if user_id is None:
+            cur.execute(
+                "DELETE FROM entries WHERE id IN (SELECT value FROM json_each(?)) RETURNING id",
+                (json.dumps(ids),),
+            )
+        else:
+            cur.execute(
+                """
+                DELETE FROM entries
+                WHERE id IN (SELECT value FROM json_each(?)) AND (user_id = ? OR user_id IS NULL)
+                RETURNING id
+                """,
+                (json.dumps(ids), user_id),
+            )
+        return [row[0] for row in cur.fetchall()]
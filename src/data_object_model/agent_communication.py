@@ -1,29 +1,33 @@
-from typing import List
-from dataclasses import dataclass, asdict
+from typing import List, Optional
+from dataclasses import dataclass, field
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentConversation:
-    def __init__(self, discussion_history: List[str] = None):
-        pass
+    # keyword-only so subclasses can declare required fields ahead of it
+    discussion_history: Optional[List[str]] = field(default=None, kw_only=True)
 
-    discussion_history: List[str] = None
-
-@dataclass
+@dataclass(slots=True)
 class AgentQuery(AgentConversation):
-    def __init__(self, user_prompt: str, discussion_history: List[str] = None):
-        super().__init__(discussion_history)
-        self.user_prompt = user_prompt
-
-    query: str = None
+    user_prompt: str
 
-@dataclass
+@dataclass(slots=True)
 class AgentResponse(AgentConversation):
-    def __init__(self, response: str, approval_required: bool = False, discussion_history: List[str] = None):
-        super().__init__(discussion_history)
-        self.response = response
-        self.approval_required = approval_required
-
-    response: str = None
-    approval_required: bool = None
-
+    response: str
+    approval_required: bool = False
+
+    def to_dict(self) -> dict:
+        """Plain dict of the response for storing in the Flask session."""
+        return {
+            "response": self.response,
+            "approval_required": self.approval_required,
+            "discussion_history": self.discussion_history,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "AgentResponse":
+        return cls(
+            response=data["response"],
+            approval_required=data.get("approval_required", False),
+            discussion_history=data.get("discussion_history"),
+        )
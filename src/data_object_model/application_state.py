@@ -1,9 +1,30 @@
-from dataclasses import dataclass
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from functools import lru_cache
+from operator import attrgetter
 from datetime import datetime, date, time
-from typing import List, Union, Tuple
+from typing import Dict, Iterable, List, Optional, Union, Tuple
 
 
-@dataclass
+# Schedules repeat the same dates and slot times across many rows; date/time are immutable,
+# so cached parse results can be shared between Entry instances.
+@lru_cache(maxsize=4096)
+def _parse_date_str(value: str) -> date:
+    # Fixed-position slice for the stored ISO YYYY-MM-DD shape; other shapes go through strptime
+    if len(value) == 10 and value[4] == "-" and value[7] == "-":
+        return date(int(value[0:4]), int(value[5:7]), int(value[8:10]))
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+@lru_cache(maxsize=4096)
+def _parse_time_str(value: str) -> time:
+    # Fixed-position slice for the stored HH:MM:SS shape; other shapes go through strptime
+    if len(value) == 8 and value[2] == ":" and value[5] == ":":
+        return time(int(value[0:2]), int(value[3:5]), int(value[6:8]))
+    return datetime.strptime(value, "%H:%M:%S").time()
+
+
+@dataclass(slots=True)
 class Entry:
     entry_id: int
     entry_date: date
@@ -13,11 +34,14 @@ class Entry:
     provider: str
     note: str
     is_selected: bool
+    # Match keys for the agent's text filters, derived once from provider/title in __init__
+    provider_norm: str = field(init=False, repr=False, compare=False)
+    title_lower: str = field(init=False, repr=False, compare=False)
 
     def __init__(
             self,
              entry_id: int,
-            entry_date: Union[date, str],
+            entry_date: Union[date, datetime, str],
             start_time: Union[time, str],
             end_time: Union[time, str],
             title: str = None,
@@ -32,14 +56,31 @@ class Entry:
         self.provider = provider
         self.note = note
         self.is_selected = is_selected
+        self.provider_norm = provider.strip().lower() if provider else ""
+        self.title_lower = title.lower() if title else ""
+
+    def to_dict(self) -> dict:
+        """JSON-ready dict of the entry, with entry_date, start_time and end_time as ISO strings."""
+        return {
+            "entry_id": self.entry_id,
+            "entry_date": self.entry_date.isoformat(),
+            "start_time": self.start_time.isoformat(),
+            "end_time": self.end_time.isoformat(),
+            "title": self.title,
+            "provider": self.provider,
+            "note": self.note,
+            "is_selected": self.is_selected,
+        }
 
     @staticmethod
-    def _parse_date(value: Union[date, str]) -> date:
+    def _parse_date(value: Union[date, datetime, str]) -> date:
+        # Normalize to a plain date once here so readers can compare entry_date directly
+        if isinstance(value, datetime):
+            return value.date()
         if isinstance(value, date):
             return value
         if isinstance(value, str):
-            # entry_date is stored as ISO YYYY-MM-DD
-            return datetime.strptime(value, "%Y-%m-%d").date()
+            return _parse_date_str(value)
         raise TypeError(f"Expected str or date for entry_date, got {type(value).__name__}")
 
     @staticmethod
@@ -47,19 +88,26 @@ class Entry:
         if isinstance(value, time):
             return value
         if isinstance(value, str):
-            # start_time / end_time stored as HH:MM:SS
-            return datetime.strptime(value, "%H:%M:%S").time()
+            return _parse_time_str(value)
         raise TypeError(f"Expected str or time for time field, got {type(value).__name__}")
 
 
-@dataclass
+_ENTRY_DAY = attrgetter("entry_date")  # bisect key for date-ordered entry lists
+
+
+@dataclass(slots=True)
 class DateRange:
     date_from: datetime
     date_to: datetime
+    # Calendar-day bounds, derived once in __init__ for the date-based filters
+    date_from_d: date = field(init=False, repr=False, compare=False)
+    date_to_d: date = field(init=False, repr=False, compare=False)
 
     def __init__(self, date_from: datetime, date_to: datetime):
         self.date_from = self._parse_datetime(date_from)
         self.date_to = self._parse_datetime(date_to)
+        self.date_from_d = self.date_from.date()
+        self.date_to_d = self.date_to.date()
 
     @staticmethod
     def _parse_datetime(value):
@@ -86,12 +134,58 @@ class DateRange:
             date_to=data["date_to"],
         )
 
-@dataclass
+@dataclass(slots=True)
 class Schedule:
     daterange: DateRange
     entries: List[Entry]
+    # Lazy entry_id -> Entry index over `entries` and the list it was built from (see _id_index)
+    _by_id: Optional[Dict[int, Entry]] = field(default=None, init=False, repr=False, compare=False)
+    _by_id_source: Optional[List[Entry]] = field(default=None, init=False, repr=False, compare=False)
 
     def __init__(self, daterange: DateRange, entries: List[Entry] = None):
         self.daterange = daterange
         self.entries = entries
+        self._by_id = None
+        self._by_id_source = None
+
+    def entries_between(self, start: date, end: date) -> List[Entry]:
+        """
+        Entries with start <= entry_date <= end, located by bisection rather than a scan.
+        Relies on `entries` being in entry_date order, as data_store.get_schedule returns them.
+        """
+        entries = self.entries or []
+        lo = bisect_left(entries, start, key=_ENTRY_DAY)
+        hi = bisect_right(entries, end, lo=lo, key=_ENTRY_DAY)
+        return entries[lo:hi]
+
+    def _id_index(self) -> Dict[int, Entry]:
+        # Rebuilt only when `entries` was reassigned or resized behind the index's back
+        entries = self.entries or []
+        if self._by_id is None or self._by_id_source is not entries or len(self._by_id) != len(entries):
+            self._by_id = {e.entry_id: e for e in entries}
+            self._by_id_source = entries
+        return self._by_id
+
+    def find_entries(self, entry_ids: Iterable[int]) -> List[Entry]:
+        """Entries with the given ids, in the order asked (unknown ids are skipped), without scanning `entries`."""
+        index = self._id_index()
+        return [index[i] for i in entry_ids if i in index]
+
+    def discard_entries(self, entry_ids: Iterable[int]) -> None:
+        """Remove entries by id from `entries`, keeping the id index in step."""
+        index = self._id_index()
+        drop = frozenset(i for i in entry_ids if i in index)
+        if not drop:
+            return
+        # Filter in place so anyone holding this list (and the index's source check) sees the same object
+        self.entries[:] = [e for e in self.entries if e.entry_id not in drop]
+        for i in drop:
+            del index[i]
+
+    def to_dict(self) -> dict:
+        """JSON-ready dict of the date range (as primitives) and every entry's to_dict()."""
+        return {
+            "daterange": self.daterange.to_primitive(),
+            "entries": [e.to_dict() for e in (self.entries or [])],
+        }
 
@@ -4,7 +4,8 @@ allow the LLM to interact with the application.
 """
 from data_object_model.application_state import Schedule, DateRange, Entry
 from data_access_layer import data_store
-from datetime import datetime, timedelta, date
+from datetime import datetime, timedelta, date, time
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Sequence, Union
 
 
@@ -68,25 +69,25 @@ def get_schedule_table(schedule: Schedule) -> Dict[str, Any]:
     """
     entries = schedule.entries or []
 
-    rows = []
-    for entry in entries:
-        rows.append(
-            {
-                "entry_id": entry.entry_id,
-                "date": entry.entry_date.isoformat(),
-                "start_time": entry.start_time.strftime("%H:%M:%S"),
-                "end_time": entry.end_time.strftime("%H:%M:%S"),
-                "title": entry.title,
-                "provider": entry.provider,
-                "note": entry.note,
-                "is_selected": entry.is_selected,
-            }
-        )
+    # timespec="seconds" keeps times as HH:MM:SS even when microseconds are set
+    rows = [
+        {
+            "entry_id": entry.entry_id,
+            "date": entry.entry_date.isoformat(),
+            "start_time": entry.start_time.isoformat(timespec="seconds"),
+            "end_time": entry.end_time.isoformat(timespec="seconds"),
+            "title": entry.title,
+            "provider": entry.provider,
+            "note": entry.note,
+            "is_selected": entry.is_selected,
+        }
+        for entry in entries
+    ]
 
     return {
         "daterange": {
-            "from_date": schedule.daterange.date_from.strftime("%Y-%m-%d %H:%M:%S"),
-            "to_date": schedule.daterange.date_to.strftime("%Y-%m-%d %H:%M:%S"),
+            "from_date": schedule.daterange.date_from.isoformat(sep=" ", timespec="seconds"),
+            "to_date": schedule.daterange.date_to.isoformat(sep=" ", timespec="seconds"),
         },
         "rows": rows,
     }
@@ -155,72 +156,83 @@ def filter_range(schedule: Schedule, entry_ids: List[str]) -> Dict[str, Any]:
     invalid_entry_ids: List[str] = []
 
     for raw_id in entry_ids:
-        try:
-            normalized_ids.add(int(raw_id))
-        except (TypeError, ValueError):
+        entry_id = _parse_entry_id(raw_id)
+        if entry_id is None:
             invalid_entry_ids.append(raw_id)
+        else:
+            normalized_ids.add(entry_id)
 
-    matched_ids: List[int] = []
+    selected_ids: List[int] = []  # schedule order
+    matched_ids = set()           # type: set[int]
 
     # Apply selection: True for matching IDs, False for others
     for entry in entries:
         if entry.entry_id in normalized_ids:
             entry.is_selected = True
-            matched_ids.append(entry.entry_id)
+            selected_ids.append(entry.entry_id)
+            matched_ids.add(entry.entry_id)
         else:
             entry.is_selected = False
 
     # Determine which *valid* IDs did not match any entry
-    unmatched_ids = normalized_ids.difference(matched_ids)
+    unmatched_ids = normalized_ids - matched_ids
 
     return {
-        "selected_entry_ids": [str(eid) for eid in matched_ids],
+        "selected_entry_ids": [str(eid) for eid in selected_ids],
         "not_found_entry_ids": [str(eid) for eid in unmatched_ids],
         "invalid_entry_ids": invalid_entry_ids,
-        "total_selected": len(matched_ids),
+        "total_selected": len(selected_ids),
     }
 
 
+def _parse_entry_id(raw_id: Any) -> Optional[int]:
+    """
+    Entry id from a tool argument: an int, or a string of decimal digits (optionally signed).
+    Returns None for anything else; checking the shape first avoids raising and catching int()'s ValueError.
+    """
+    if isinstance(raw_id, int):
+        return raw_id
+    if isinstance(raw_id, str):
+        text = raw_id.strip()
+        digits = text[1:] if text[:1] in ("-", "+") else text
+        if digits.isdecimal():
+            return int(text)
+    return None
+
+
+@lru_cache(maxsize=256)
 def _parse_24h_time_to_time(time_str: str) -> time:
     """
     Parse a 24-hour time string like '09:00' or '14:30' to a datetime.time.
+    Cached: the model reuses a handful of times ('09:00', '10:00', ...) across calls.
 
     Accepts:
       - 'HH:MM'  (e.g., '09:00', '14:30')
       - 'HH:MM:SS' (e.g., '09:00:00', '14:30:00') for robustness
+      - any field with a single digit (e.g., '9:05', '9:5')
     """
     time_str = time_str.strip()
 
-    # Try HH:MM, then HH:MM:SS for flexibility
-    for fmt in ("%H:%M", "%H:%M:%S"):
+    # Two or three ':'-separated fields of one or two decimal digits each ('9:5' is 09:05)
+    fields = time_str.split(":")
+    if len(fields) in (2, 3) and all(1 <= len(f) <= 2 and f.isdecimal() for f in fields):
         try:
-            return datetime.strptime(time_str, fmt).time()
+            return time(*map(int, fields))
         except ValueError:
-            continue
+            pass  # out of range, e.g. '24:00'
 
     raise ValueError(f"Invalid 24-hour time format: {time_str!r}. Expected 'HH:MM' or 'HH:MM:SS'.")
 
 
-def _entry_date_to_date(entry_date_value: Any) -> date:
+def _parse_iso_date(value: str) -> date:
     """
-    Normalize an Entry.entry_date value to a datetime.date.
-
-    Accepts:
-      - datetime.date
-      - datetime.datetime
-      - 'YYYY-MM-DD' string
-
-    Raises ValueError if it cannot be parsed.
+    Parse a tool-call date, 'YYYY-MM-DD' or 'YYYY-MM-DD HH:MM:SS', to a datetime.date.
+    Uses the C fromisoformat parsers; any time portion is dropped. Raises ValueError.
     """
-    if isinstance(entry_date_value, date) and not isinstance(entry_date_value, datetime):
-        return entry_date_value
-    if isinstance(entry_date_value, datetime):
-        return entry_date_value.date()
-    if isinstance(entry_date_value, str):
-        # Expect 'YYYY-MM-DD'
-        return datetime.strptime(entry_date_value, "%Y-%m-%d").date()
-
-    raise ValueError(f"Unsupported entry_date type: {type(entry_date_value)!r}")
+    value = value.strip()
+    if len(value) == 10:
+        return date.fromisoformat(value)
+    return datetime.fromisoformat(value).date()
 
 
 def add_entry(
@@ -287,21 +299,15 @@ def add_entry(
     """
     # 1. Parse date with a forgiving strategy:
     #    - Accept 'YYYY-MM-DD HH:MM:SS'
-    #    - Accept 'YYYY-MM-DD' and default time to 00:00:00
+    #    - Accept 'YYYY-MM-DD' (only the date is kept either way)
     try:
-        if len(date) == 10:  # e.g., "2025-11-14"
-            dt = datetime.strptime(date, "%Y-%m-%d")
-            dt = dt.replace(hour=0, minute=0, second=0)
-        else:
-            dt = datetime.strptime(date, "%Y-%m-%d %H:%M:%S")
+        entry_date = _parse_iso_date(date)
     except ValueError:
         raise ValueError(
             f"Invalid date format: {date!r}. "
             "Expected 'YYYY-MM-DD HH:MM:SS' or 'YYYY-MM-DD'."
         )
 
-    entry_date = dt.date()
-
     # 2. Parse 24h times to time objects
     try:
         start_t = _parse_24h_time_to_time(start_time)
@@ -360,6 +366,9 @@ def delete_by_filter(
       - Delegates actual deletion to `delete_entries` (DB + in-memory update).
       - Returns the same core summary shape as `delete_entries`, plus debug info.
 
+    Entries stored without a provider read back from the data store with provider
+    "Unassigned", so provider="Unassigned" matches them (as shown in the schedule table).
+
     Safety:
       - If *no* filters are provided, no entries are deleted and an error is returned.
     """
@@ -389,21 +398,21 @@ def delete_by_filter(
     try:
         if date:
             # Exact single day
-            d = datetime.strptime(date.strip(), "%Y-%m-%d").date()
+            d = _parse_iso_date(date)
             start_date = d
             end_date = d
         elif from_date or to_date:
             if from_date:
-                start_date = datetime.strptime(from_date.strip(), "%Y-%m-%d").date()
+                start_date = _parse_iso_date(from_date)
             else:
                 # default to current view's start
-                start_date = schedule.daterange.date_from.date()
+                start_date = schedule.daterange.date_from_d
 
             if to_date:
-                end_date = datetime.strptime(to_date.strip(), "%Y-%m-%d").date()
+                end_date = _parse_iso_date(to_date)
             else:
                 # default to current view's end
-                end_date = schedule.daterange.date_to.date()
+                end_date = schedule.daterange.date_to_d
         else:
             # No explicit date filter: operate over what's in schedule.entries
             # (which is already scoped by schedule.daterange).
@@ -419,34 +428,24 @@ def delete_by_filter(
 
     # --- Select candidate entries --------------------------------------------
     candidate_ids: List[int] = []
+    add_candidate = candidate_ids.append
 
-    for entry in entries:
-        try:
-            entry_day = _entry_date_to_date(entry.entry_date)
-        except ValueError:
-            # If the entry_date is malformed, skip it rather than risking wrong deletion
-            continue
-
-        # Date filter (if any)
-        if start_date is not None and end_date is not None:
-            if not (start_date <= entry_day <= end_date):
-                continue
+    # Date filter (if any): entries are date-ordered, so the range is one contiguous slice
+    if start_date is not None and end_date is not None:
+        entries = schedule.entries_between(start_date, end_date)
 
-        # Provider filter (if provided)
+    for entry in entries:
+        # Provider filter (if provided); Entry precomputes the normalized provider/title
         if provider_norm is not None:
-            if not entry.provider:
-                continue
-            if entry.provider.strip().lower() != provider_norm:
+            if entry.provider_norm != provider_norm:
                 continue
 
         # Title substring filter (if provided)
         if title_sub_norm is not None:
-            if not entry.title:
-                continue
-            if title_sub_norm not in entry.title.lower():
+            if title_sub_norm not in entry.title_lower:
                 continue
 
-        candidate_ids.append(entry.entry_id)
+        add_candidate(entry.entry_id)
 
     if not candidate_ids:
         return {
@@ -487,7 +486,7 @@ def delete_entries(
 
     This function:
       - Finds all entries in `schedule.entries` whose `entry_id` is in `entry_ids`.
-      - Deletes each one from the database via `data_store.remove_entry` with user_id=1.
+      - Deletes them from the database in one statement via `data_store.remove_entries` with user_id=1.
       - Removes them from the in-memory `schedule.entries` list.
 
     Parameters
@@ -507,20 +506,9 @@ def delete_entries(
             "total_deleted": int
         }
     """
-    entries = schedule.entries or []
-
-    # Normalize IDs so we can compare safely whether they come as int or str
-    # Assume Entry.entry_id is an int; adjust if your model uses strings.
-    normalized_ids: List[int] = []
-    for eid in entry_ids:
-        if isinstance(eid, int):
-            normalized_ids.append(eid)
-        else:
-            # attempt to parse string IDs to int; ignore ones that can’t be parsed
-            try:
-                normalized_ids.append(int(eid))
-            except (TypeError, ValueError):
-                continue
+    # Normalize IDs so we can compare safely whether they come as int or str;
+    # IDs that can't be parsed are ignored. Assume Entry.entry_id is an int.
+    normalized_ids: List[int] = [eid for eid in map(_parse_entry_id, entry_ids) if eid is not None]
 
     if not normalized_ids:
         return {
@@ -528,22 +516,16 @@ def delete_entries(
             "total_deleted": 0,
         }
 
-    id_set = set(normalized_ids)
-
-    # Identify entries to delete
-    targets: List[Entry] = [e for e in entries if e.entry_id in id_set]
-    deleted_ids: List[int] = []
+    # Identify entries to delete (id index lookup, deduplicated, in the order given)
+    targets: List[Entry] = schedule.find_entries(dict.fromkeys(normalized_ids))
 
-    for entry in targets:
-        # Hard-code user_id=1 for this POC
-        affected = data_store.remove_entry(entry, user_id=1)
-        if affected > 0:
-            deleted_ids.append(entry.entry_id)
+    # One bulk DELETE; hard-code user_id=1 for this POC
+    removed = set(data_store.remove_entries(targets, user_id=1))
+    deleted_ids: List[int] = [e.entry_id for e in targets if e.entry_id in removed]
 
     # Remove deleted entries from the in-memory schedule
     if deleted_ids:
-        remaining = [e for e in entries if e.entry_id not in deleted_ids]
-        schedule.entries = remaining
+        schedule.discard_entries(deleted_ids)
 
     return {
         "deleted_entry_ids": deleted_ids,